@@ -1,23 +1,33 @@
-from fastapi import FastAPI, Depends, Query
+from datetime import date
+from fastapi import FastAPI, Depends, Query, HTTPException
 from llama_index.core.agent import ReActAgent
 from ai_assistant.agent import TravelAgent
-from ai_assistant.models import AgentAPIResponse
+from ai_assistant.models import AgentAPIResponse, ReservationPage, ReservationType
 from ai_assistant.prompts import agent_prompt_tpl
 from ai_assistant.tools import (
     reserve_bus,
     reserve_hotel,
     reserve_restaurant,
     reserve_flight,
-    delete_all_reservations
+    delete_all_reservations,
+    travel_guide_rag,
 
 )
+from ai_assistant.reservations import get_reservation_index
+from ai_assistant.reports import get_trip_report_cache
+from ai_assistant.config import get_agent_settings
 
 def get_agent() -> ReActAgent:
     return TravelAgent(agent_prompt_tpl).get_agent()
 
 
+SETTINGS = get_agent_settings()
+
 app = FastAPI(title="AI Agent")
 
+# Construir los indices de reservas al iniciar, no en la primera consulta
+get_reservation_index()
+
 
 @app.get("/recommendations/cities")
 def recommend_cities(
@@ -58,30 +68,46 @@ def reserve_restaurant_api(reservation_time_str: str, restaurant: str, city: str
     reservation = reserve_restaurant(reservation_time_str, restaurant, city, dish)
     return {"status": "OK", "reservation": reservation.dict()}
 
-@app.get("/trip/report")
-def trip_summary(agent: ReActAgent = Depends(get_agent)):
-
-    prompt = """
-        Generate a trip summary using the tool `trip_summary_tool`.
-        Once the summary is generated, analyze it and provide a detailed report.
-
-        The detailed report should contain:
-        1. Key highlights of the trip.
-        2. Identified issues or recommendations.
-        3. Additional insights based on the trip summary.
+@app.get("/travel-guide/search")
+def search_travel_guide(query: str, top_k: int = Query(2, ge=1, le=20)):
+    # Solo recuperacion (embedding de la consulta + vector store + docstore), sin LLM
+    nodes = travel_guide_rag.get_retriever(similarity_top_k=top_k).retrieve(query)
+    return {
+        "status": "OK",
+        "results": [
+            {"node_id": node.node_id, "score": node.score, "text": node.get_content()}
+            for node in nodes
+        ],
+    }
 
-        Begin by creating the trip summary with `trip_summary_tool`, then proceed with the analysis and report.
-
-        Ensure both the trip summary and the detailed report are in **Spanish** and are included in your **final Answer**.
-        Do not include any internal thoughts or reasoning—only return the final answer containing the summary and report.
-    """
+@app.get("/reservations")
+def list_reservations(
+    reservation_type: ReservationType | None = Query(None, alias="type"),
+    city: str | None = None,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    cursor: str | None = None,
+    limit: int = Query(20, ge=1, le=100),
+):
+    index = get_reservation_index()
+    index.sync(SETTINGS.log_file)  # Otro worker pudo escribir el log
+    try:
+        reservations, next_cursor = index.query(
+            reservation_type=reservation_type,
+            city=city,
+            start_date=start_date,
+            end_date=end_date,
+            cursor=cursor,
+            limit=limit,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return ReservationPage(status="OK", reservations=reservations, next_cursor=next_cursor)
 
-    response = agent.chat(prompt)
-    
-    return AgentAPIResponse(
-        status="OK",
-        agent_response=str(response)
-    )
+@app.get("/trip/report")
+def trip_summary():
+    report = get_trip_report_cache(SETTINGS.log_file).get_report()
+    return AgentAPIResponse(status="OK", agent_response=report)
 
 @app.delete("/trip/delete-all")
 def delete_all_trip_reservations():
@@ -1,4 +1,5 @@
 from functools import cache
+from typing import Literal
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -11,6 +12,13 @@ class AgentSettings(BaseSettings):
     travel_guide_data_path: str = "data"
     OPENAI_API_KEY: str = "OPENAI_API_KEY"
     log_file: str = "trip.json"
+    # "float" usa el SimpleVectorStore en JSON; "int8" el QuantizedVectorStore
+    vector_store_mode: Literal["float", "int8"] = "float"
+    vector_store_reduction: Literal["none", "pca", "truncate"] = "none"
+    vector_store_dims: int | None = None
+    # "json" usa docstore.json; "lazy" el docstore compacto con lectura on-demand
+    docstore_mode: Literal["json", "lazy"] = "json"
+    docstore_cache_size: int = 128
 
 
 @cache
@@ -0,0 +1,248 @@
+"""
+Docstore compacto con carga lazy del texto de los nodos.
+
+El `docstore.json` de llama-index guarda el texto completo de todos los nodos y
+`load_index_from_storage` lo parsea entero, aunque una consulta solo necesita
+los top-k nodos. Aqui los nodos van comprimidos uno tras otro en `docstore.bin`
+y `docstore.idx.json` guarda sus offsets (y las colecciones chicas: metadata y
+ref_doc_info). Al iniciar solo se carga el indice; cada nodo se lee del disco
+cuando se pide, con un cache LRU.
+
+    python -m ai_assistant.docstore travel_guide_store
+"""
+import os
+import sys
+import json
+import zlib
+import fcntl
+from contextlib import contextmanager
+from threading import Lock
+from functools import lru_cache
+from typing import Any
+from llama_index.core.storage.kvstore.types import BaseKVStore, DEFAULT_COLLECTION
+from llama_index.core.storage.docstore.keyval_docstore import KVDocumentStore
+
+DOCSTORE_JSON_FNAME = "docstore.json"
+DOCSTORE_BIN_FNAME = "docstore.bin"
+DOCSTORE_INDEX_FNAME = "docstore.idx.json"
+DOCSTORE_FORMAT_VERSION = 2
+# Coleccion con los nodos completos; el resto se mantiene en memoria
+NODE_COLLECTION = "docstore/data"
+DOCSTORE_LOCK_FNAME = "docstore.lock"
+
+
+@contextmanager
+def docstore_lock(persist_dir: str):
+    """
+    Lock entre procesos para convertir o reescribir el docstore compacto.
+    """
+    with open(os.path.join(persist_dir, DOCSTORE_LOCK_FNAME), "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def source_signature(persist_dir: str) -> list[int] | None:
+    """
+    (tamaño, mtime_ns) del `docstore.json` del que se genera el docstore compacto.
+    """
+    try:
+        stat = os.stat(os.path.join(persist_dir, DOCSTORE_JSON_FNAME))
+    except FileNotFoundError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def compact_docstore_is_stale(persist_dir: str) -> bool:
+    """
+    True si falta el docstore compacto o no se genero de la version actual de
+    `docstore.json` (por ejemplo tras un pull que lo modifico).
+    """
+    index_path = os.path.join(persist_dir, DOCSTORE_INDEX_FNAME)
+    if not os.path.exists(index_path):
+        return True
+    source = source_signature(persist_dir)
+    if source is None:
+        # Sin docstore.json no hay de donde regenerarlo; se usa el compacto tal cual
+        return False
+    with open(index_path, "r") as file:
+        index = json.load(file)
+    return index.get("version") != DOCSTORE_FORMAT_VERSION or index.get("source") != source
+
+
+def write_compact_docstore(
+    persist_dir: str, collections: dict[str, dict], nodes, source: list[int] | None = None
+) -> None:
+    """
+    Escribe `nodes` (iterable de (id, dict)) y las demas colecciones en formato
+    compacto. `source` es la firma del `docstore.json` del que se generaron.
+    """
+    bin_path = os.path.join(persist_dir, DOCSTORE_BIN_FNAME)
+    index_path = os.path.join(persist_dir, DOCSTORE_INDEX_FNAME)
+    # Temporales por proceso: dos procesos escribiendo a la vez no se pisan
+    bin_tmp_path = f"{bin_path}.{os.getpid()}.tmp"
+    index_tmp_path = f"{index_path}.{os.getpid()}.tmp"
+    offsets = {}
+    with open(bin_tmp_path, "wb") as file:
+        for node_id, node_dict in nodes:
+            body = zlib.compress(json.dumps(node_dict).encode())
+            offsets[node_id] = [file.tell(), len(body)]
+            file.write(body)
+    with open(index_tmp_path, "w") as file:
+        json.dump(
+            {
+                "version": DOCSTORE_FORMAT_VERSION,
+                "source": source,
+                "offsets": offsets,
+                "collections": collections,
+            },
+            file,
+        )
+    # Primero el binario: un indice nuevo nunca apunta a un binario viejo
+    os.replace(bin_tmp_path, bin_path)
+    os.replace(index_tmp_path, index_path)
+
+
+def convert_docstore(persist_dir: str) -> None:
+    """
+    Convierte el `docstore.json` de un indice persistido al formato compacto.
+    """
+    # Firma tomada antes de leer: si el archivo cambia mientras tanto, se reconvierte
+    source = source_signature(persist_dir)
+    with open(os.path.join(persist_dir, DOCSTORE_JSON_FNAME), "r") as file:
+        data = json.load(file)
+    nodes = data.pop(NODE_COLLECTION, {})
+    write_compact_docstore(persist_dir, data, nodes.items(), source=source)
+
+
+class LazyKVStore(BaseKVStore):
+    """
+    KV store de solo un archivo: la coleccion de nodos se lee on-demand con
+    offsets y un LRU; el resto de colecciones vive en memoria. Las escrituras
+    quedan en memoria hasta `persist`.
+    """
+
+    def __init__(self, persist_dir: str, cache_size: int = 128):
+        self.persist_dir = persist_dir
+        self.cache_size = cache_size
+        self._lock = Lock()
+        self._open()
+
+    def _open(self):
+        with open(os.path.join(self.persist_dir, DOCSTORE_INDEX_FNAME), "r") as file:
+            index = json.load(file)
+        if index.get("version") != DOCSTORE_FORMAT_VERSION:
+            raise ValueError(f"Unsupported docstore format version: {index.get('version')}")
+        self._offsets: dict[str, list[int]] = index["offsets"]
+        self._collections: dict[str, dict] = index["collections"]
+        self._source: list[int] | None = index.get("source")
+        self._pending: dict[str, dict] = {}  # nodos agregados o modificados sin persistir
+        # pread con offset explicito: seguro entre threads y entre workers tras un fork
+        self._fd = os.open(os.path.join(self.persist_dir, DOCSTORE_BIN_FNAME), os.O_RDONLY)
+        self._read_node = lru_cache(maxsize=self.cache_size)(self._read_node_uncached)
+
+    def _read_node_uncached(self, key: str) -> dict:
+        offset, length = self._offsets[key]
+        return json.loads(zlib.decompress(os.pread(self._fd, length, offset)))
+
+    def _node_ids(self) -> list[str]:
+        return list(dict.fromkeys([*self._offsets, *self._pending]))
+
+    def put(self, key: str, val: dict, collection: str = DEFAULT_COLLECTION) -> None:
+        with self._lock:
+            if collection == NODE_COLLECTION:
+                self._pending[key] = val.copy()
+            else:
+                self._collections.setdefault(collection, {})[key] = val.copy()
+
+    async def aput(self, key: str, val: dict, collection: str = DEFAULT_COLLECTION) -> None:
+        self.put(key, val, collection)
+
+    def get(self, key: str, collection: str = DEFAULT_COLLECTION) -> dict | None:
+        if collection != NODE_COLLECTION:
+            val = self._collections.get(collection, {}).get(key)
+            return None if val is None else val.copy()
+        if key in self._pending:
+            return self._pending[key].copy()
+        if key not in self._offsets:
+            return None
+        return self._read_node(key).copy()
+
+    async def aget(self, key: str, collection: str = DEFAULT_COLLECTION) -> dict | None:
+        return self.get(key, collection)
+
+    def get_all(self, collection: str = DEFAULT_COLLECTION) -> dict[str, dict]:
+        if collection != NODE_COLLECTION:
+            return {key: val.copy() for key, val in self._collections.get(collection, {}).items()}
+        return {key: self.get(key, collection) for key in self._node_ids()}
+
+    async def aget_all(self, collection: str = DEFAULT_COLLECTION) -> dict[str, dict]:
+        return self.get_all(collection)
+
+    def delete(self, key: str, collection: str = DEFAULT_COLLECTION) -> bool:
+        with self._lock:
+            if collection != NODE_COLLECTION:
+                return self._collections.get(collection, {}).pop(key, None) is not None
+            deleted = self._pending.pop(key, None) is not None
+            deleted = self._offsets.pop(key, None) is not None or deleted
+            return deleted
+
+    async def adelete(self, key: str, collection: str = DEFAULT_COLLECTION) -> bool:
+        return self.delete(key, collection)
+
+    def persist(self, persist_dir: str) -> None:
+        with self._lock:
+            nodes = ((key, self.get(key, NODE_COLLECTION)) for key in self._node_ids())
+            same_dir = os.path.abspath(persist_dir) == os.path.abspath(self.persist_dir)
+            # Se conserva la firma del docstore.json de origen: los nodos agregados
+            # solo viven en el compacto y no deben perderse con una reconversion
+            source = self._source if same_dir else None
+            with docstore_lock(persist_dir):
+                write_compact_docstore(persist_dir, self._collections, nodes, source=source)
+                if same_dir:
+                    os.close(self._fd)
+                    self._open()
+
+    @property
+    def cache_info(self):
+        return self._read_node.cache_info()
+
+
+class LazyDocumentStore(KVDocumentStore):
+    """
+    Docstore respaldado por LazyKVStore; compatible con StorageContext.
+    """
+
+    def __init__(self, kvstore: LazyKVStore, namespace: str | None = None):
+        super().__init__(kvstore, namespace=namespace)
+
+    @classmethod
+    def from_persist_dir(cls, persist_dir: str, cache_size: int = 128) -> "LazyDocumentStore":
+        return cls(LazyKVStore(persist_dir, cache_size=cache_size))
+
+    def persist(self, persist_path: str, fs: Any = None) -> None:
+        # StorageContext.persist pasa la ruta de docstore.json; se usa su directorio
+        self._kvstore.persist(os.path.dirname(persist_path))
+
+
+def load_lazy_docstore(persist_dir: str, cache_size: int = 128) -> LazyDocumentStore:
+    """
+    Carga el docstore compacto del indice; si no existe o `docstore.json` cambio
+    desde la ultima conversion, lo (re)crea desde docstore.json.
+    """
+    # Con varios procesos arrancando a la vez solo uno convierte; el resto espera y lo reutiliza
+    with docstore_lock(persist_dir):
+        if compact_docstore_is_stale(persist_dir):
+            print(f"converting {DOCSTORE_JSON_FNAME} in {persist_dir} to the compact docstore format")
+            convert_docstore(persist_dir)
+        # Dentro del lock: el indice y el binario que se abren son del mismo par
+        return LazyDocumentStore.from_persist_dir(persist_dir, cache_size=cache_size)
+
+
+if __name__ == "__main__":
+    store_dir = sys.argv[1] if len(sys.argv) > 1 else "travel_guide_store"
+    with docstore_lock(store_dir):
+        convert_docstore(store_dir)
+    print(f"wrote {DOCSTORE_BIN_FNAME} and {DOCSTORE_INDEX_FNAME} in {store_dir}")
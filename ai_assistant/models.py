@@ -36,3 +36,16 @@ class AgentAPIResponse(BaseModel):
     status: str
     agent_response: str
     timestamp: datetime = Field(default_factory=datetime.now)
+
+
+class ReservationType(str, Enum):
+    flight = "FLIGHT"
+    bus = "BUS"
+    hotel = "HOTEL"
+    restaurant = "RESTAURANT"
+
+
+class ReservationPage(BaseModel):
+    status: str
+    reservations: list[dict]
+    next_cursor: str | None = None
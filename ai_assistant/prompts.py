@@ -97,6 +97,22 @@ agent_prompt_str = """
     Below is the ongoing conversation, consisting of alternating human and assistant messages:
     """
 
+# Prompt for one city section of the trip report
+city_report_str = """
+    You are an expert travel guide specializing in Bolivia. Below are the reservations of a traveler in {city}.
+    ---------------------
+    {activities_str}
+    ---------------------
+    Write a short analysis of this part of the trip with:
+    1. Key highlights of the stay in {city}.
+    2. Identified issues or recommendations (schedule conflicts, missing hotel nights, costs).
+    3. Additional insights about the city relevant to these reservations.
+
+    Do not repeat the list of reservations, do not include any internal thoughts or reasoning.
+    Answer (in Spanish):
+    """
+
 
 travel_guide_qa_tpl = PromptTemplate(travel_guide_qa_str)
 agent_prompt_tpl = PromptTemplate(agent_prompt_str)
+city_report_tpl = PromptTemplate(city_report_str)
@@ -0,0 +1,303 @@
+import os
+import json
+import numpy as np
+from typing import Any
+from llama_index.core.bridge.pydantic import PrivateAttr
+from llama_index.core.schema import BaseNode
+from llama_index.core.vector_stores.types import (
+    BasePydanticVectorStore,
+    VectorStoreQuery,
+    VectorStoreQueryResult,
+)
+
+QUANTIZED_VECTOR_STORE_FNAME = "quantized__vector_store.npz"
+SIMPLE_VECTOR_STORE_FNAME = "default__vector_store.json"
+REDUCTIONS = ("none", "pca", "truncate")
+# Filas por bloque al puntuar, para no convertir toda la matriz int8 a float de una vez
+SCORE_BLOCK_SIZE = 4096
+
+
+def simple_store_signature(persist_path: str) -> list[int] | None:
+    """
+    (tamaño, mtime_ns) del SimpleVectorStore del que se genera el store int8.
+    """
+    try:
+        stat = os.stat(persist_path)
+    except FileNotFoundError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def quantize(vectors: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Cuantiza cada vector a int8 con su propia escala simetrica (max|v| / 127).
+    """
+    scales = np.abs(vectors).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    codes = np.rint(vectors / scales[:, None]).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+class QuantizedVectorStore(BasePydanticVectorStore):
+    """
+    Vector store en memoria con vectores int8 y escala por vector.
+
+    Opcionalmente reduce la dimension antes de cuantizar, con PCA ajustado sobre
+    los vectores guardados o truncando a las primeras `dims` componentes (estilo
+    Matryoshka). La similitud es coseno, igual que SimpleVectorStore, calculada
+    con NumPy sobre toda la matriz. El texto de los nodos queda en el docstore.
+    """
+
+    stores_text: bool = False
+    reduction: str = "none"
+    dims: int | None = None
+
+    _ids: np.ndarray = PrivateAttr()
+    _ref_doc_ids: np.ndarray = PrivateAttr()
+    _codes: np.ndarray = PrivateAttr()
+    _scales: np.ndarray = PrivateAttr()
+    _norms: np.ndarray = PrivateAttr()
+    _mean: np.ndarray | None = PrivateAttr(default=None)
+    _components: np.ndarray | None = PrivateAttr(default=None)
+    _source: list[int] | None = PrivateAttr(default=None)
+
+    def __init__(
+        self,
+        ids: np.ndarray,
+        ref_doc_ids: np.ndarray,
+        codes: np.ndarray,
+        scales: np.ndarray,
+        reduction: str = "none",
+        dims: int | None = None,
+        mean: np.ndarray | None = None,
+        components: np.ndarray | None = None,
+        source: list[int] | None = None,
+    ):
+        if reduction not in REDUCTIONS:
+            raise ValueError(f"Unknown reduction {reduction!r}, expected one of {REDUCTIONS}")
+        super().__init__(reduction=reduction, dims=dims if reduction != "none" else None)
+        self._ids = np.asarray(ids, dtype=str)
+        self._ref_doc_ids = np.asarray(ref_doc_ids, dtype=str)
+        self._codes = codes
+        self._scales = scales
+        self._mean = mean
+        self._components = components
+        self._source = source
+        self._norms = self._compute_norms(codes, scales)
+
+    @classmethod
+    def from_embeddings(
+        cls,
+        embedding_dict: dict[str, list[float]],
+        text_id_to_ref_doc_id: dict[str, str],
+        reduction: str = "none",
+        dims: int | None = None,
+    ) -> "QuantizedVectorStore":
+        ids = list(embedding_dict.keys())
+        vectors = np.asarray([embedding_dict[node_id] for node_id in ids], dtype=np.float32)
+        mean = components = None
+        if reduction == "pca":
+            if dims is None:
+                raise ValueError("PCA reduction requires dims")
+            # PCA sobre vectores normalizados: la similitud es coseno y el centrado
+            # no debe depender de la escala de cada vector (ni de la de la consulta)
+            unit = vectors / cls._row_norms(vectors)
+            mean = unit.mean(axis=0)
+            # Componentes principales: filas de Vt de la SVD de los vectores centrados
+            _, _, vt = np.linalg.svd(unit - mean, full_matrices=False)
+            components = np.ascontiguousarray(vt[:dims].T, dtype=np.float32)
+        elif reduction == "truncate" and dims is None:
+            raise ValueError("Truncate reduction requires dims")
+
+        store = cls(
+            ids=np.asarray(ids, dtype=str),
+            ref_doc_ids=np.asarray([text_id_to_ref_doc_id.get(node_id, "") for node_id in ids], dtype=str),
+            codes=np.zeros((0, 0), dtype=np.int8),
+            scales=np.zeros(0, dtype=np.float32),
+            reduction=reduction,
+            dims=dims,
+            mean=mean,
+            components=components,
+        )
+        store._codes, store._scales = quantize(store._project(vectors))
+        store._norms = cls._compute_norms(store._codes, store._scales)
+        return store
+
+    @classmethod
+    def from_simple_persist_path(
+        cls, persist_path: str, reduction: str = "none", dims: int | None = None
+    ) -> "QuantizedVectorStore":
+        """
+        Convierte un SimpleVectorStore persistido (JSON con floats) a int8.
+        """
+        source = simple_store_signature(persist_path)
+        with open(persist_path, "r") as file:
+            data = json.load(file)
+        store = cls.from_embeddings(
+            data["embedding_dict"], data["text_id_to_ref_doc_id"], reduction=reduction, dims=dims
+        )
+        store._source = source
+        return store
+
+    @classmethod
+    def from_persist_path(cls, persist_path: str) -> "QuantizedVectorStore":
+        with np.load(persist_path, allow_pickle=False) as data:
+            return cls(
+                ids=data["ids"],
+                ref_doc_ids=data["ref_doc_ids"],
+                codes=data["codes"],
+                scales=data["scales"],
+                reduction=str(data["reduction"]),
+                dims=int(data["dims"]) or None,
+                mean=data["mean"] if "mean" in data else None,
+                components=data["components"] if "components" in data else None,
+                source=data["source"].tolist() if "source" in data else None,
+            )
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "QuantizedVectorStore"
+
+    @property
+    def client(self) -> None:
+        return None
+
+    @property
+    def source(self) -> list[int] | None:
+        return self._source
+
+    @property
+    def nbytes(self) -> int:
+        arrays = [self._codes, self._scales, self._norms, self._mean, self._components]
+        return sum(array.nbytes for array in arrays if array is not None)
+
+    def add(self, nodes: list[BaseNode], **add_kwargs: Any) -> list[str]:
+        if not nodes:
+            return []
+        vectors = np.asarray([node.get_embedding() for node in nodes], dtype=np.float32)
+        codes, scales = quantize(self._project(vectors))
+        if len(self._codes):
+            codes = np.concatenate([self._codes, codes])
+            scales = np.concatenate([self._scales, scales])
+        self._codes, self._scales = codes, scales
+        self._norms = self._compute_norms(codes, scales)
+        self._ids = np.concatenate([self._ids, [node.node_id for node in nodes]])
+        self._ref_doc_ids = np.concatenate([self._ref_doc_ids, [node.ref_doc_id or "" for node in nodes]])
+        return [node.node_id for node in nodes]
+
+    def delete(self, ref_doc_id: str, **delete_kwargs: Any) -> None:
+        keep = self._ref_doc_ids != ref_doc_id
+        self._ids = self._ids[keep]
+        self._ref_doc_ids = self._ref_doc_ids[keep]
+        self._codes = self._codes[keep]
+        self._scales = self._scales[keep]
+        self._norms = self._norms[keep]
+
+    def query(self, query: VectorStoreQuery, **kwargs: Any) -> VectorStoreQueryResult:
+        if query.filters is not None:
+            raise ValueError("Metadata filters are not supported by QuantizedVectorStore")
+        if query.query_embedding is None:
+            raise ValueError("QuantizedVectorStore requires a query embedding")
+
+        rows = np.arange(len(self._ids))
+        if query.node_ids:
+            rows = np.flatnonzero(np.isin(self._ids, query.node_ids))
+
+        scores = self.score(np.asarray(query.query_embedding, dtype=np.float32), rows)
+        top_k = min(query.similarity_top_k, len(rows))
+        if top_k == 0:
+            return VectorStoreQueryResult(similarities=[], ids=[])
+        top = np.argpartition(-scores, top_k - 1)[:top_k]
+        top = top[np.argsort(-scores[top])]
+        return VectorStoreQueryResult(
+            similarities=scores[top].tolist(),
+            ids=self._ids[rows[top]].tolist(),
+        )
+
+    def score(self, query_embedding: np.ndarray, rows: np.ndarray | None = None) -> np.ndarray:
+        """
+        Similitud coseno entre la consulta y las filas indicadas (todas por defecto).
+        """
+        query_vector = self._project(query_embedding[None, :])[0]
+        query_norm = np.linalg.norm(query_vector) or 1.0
+        if rows is None:
+            rows = np.arange(len(self._ids))
+        dots = np.empty(len(rows), dtype=np.float32)
+        for start in range(0, len(rows), SCORE_BLOCK_SIZE):
+            block = rows[start:start + SCORE_BLOCK_SIZE]
+            dots[start:start + len(block)] = self._codes[block].astype(np.float32) @ query_vector
+        return dots * self._scales[rows] / (self._norms[rows] * query_norm)
+
+    def persist(self, persist_path: str, fs: Any = None) -> None:
+        # StorageContext.persist pasa la ruta del JSON por defecto; se guarda al lado
+        if os.path.basename(persist_path) != QUANTIZED_VECTOR_STORE_FNAME:
+            persist_path = os.path.join(os.path.dirname(persist_path), QUANTIZED_VECTOR_STORE_FNAME)
+        arrays = {
+            "ids": self._ids,
+            "ref_doc_ids": self._ref_doc_ids,
+            "codes": self._codes,
+            "scales": self._scales,
+            "reduction": np.asarray(self.reduction),
+            "dims": np.asarray(self.dims or 0),
+        }
+        if self._mean is not None:
+            arrays["mean"] = self._mean
+        if self._components is not None:
+            arrays["components"] = self._components
+        if self._source is not None:
+            arrays["source"] = np.asarray(self._source, dtype=np.int64)
+        os.makedirs(os.path.dirname(persist_path) or ".", exist_ok=True)
+        # Temporal por proceso y reemplazo atomico: otro worker que arranca a la
+        # vez nunca lee un npz a medias (igual que write_reservations)
+        tmp_path = f"{persist_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as file:
+            np.savez(file, **arrays)
+        os.replace(tmp_path, persist_path)
+
+    def _project(self, vectors: np.ndarray) -> np.ndarray:
+        if self.reduction == "pca" and self._components is not None:
+            return (vectors / self._row_norms(vectors) - self._mean) @ self._components
+        if self.reduction == "truncate":
+            return vectors[:, :self.dims]
+        return vectors
+
+    @staticmethod
+    def _row_norms(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return norms
+
+    @staticmethod
+    def _compute_norms(codes: np.ndarray, scales: np.ndarray) -> np.ndarray:
+        norms = np.sqrt(np.einsum("ij,ij->i", codes, codes, dtype=np.float32)) * scales
+        norms[norms == 0] = 1.0
+        return norms.astype(np.float32)
+
+
+def load_quantized_vector_store(
+    store_path: str, reduction: str = "none", dims: int | None = None
+) -> QuantizedVectorStore:
+    """
+    Carga el vector store int8 del indice; si no existe, tiene otra reduccion o
+    el SimpleVectorStore persistido cambio desde que se genero, lo crea a partir
+    de este y lo guarda junto a el.
+    """
+    quantized_path = os.path.join(store_path, QUANTIZED_VECTOR_STORE_FNAME)
+    simple_path = os.path.join(store_path, SIMPLE_VECTOR_STORE_FNAME)
+    source = simple_store_signature(simple_path)
+    if os.path.exists(quantized_path):
+        store = QuantizedVectorStore.from_persist_path(quantized_path)
+        same_config = store.reduction == reduction and store.dims == (dims if reduction != "none" else None)
+        # Sin el JSON no hay de donde regenerarlo; se usa el npz tal cual
+        if same_config and (source is None or store.source == source):
+            return store
+    if not os.path.exists(simple_path):
+        raise FileNotFoundError(
+            f"VECTOR_STORE_MODE=int8 needs {simple_path} (the float vector store written by "
+            f"ingest_data) to build {QUANTIZED_VECTOR_STORE_FNAME}, and it does not exist. "
+            f"Re-ingest the travel guide data or unset VECTOR_STORE_MODE."
+        )
+    print(f"quantizing vector store in {store_path} (reduction={reduction}, dims={dims})")
+    store = QuantizedVectorStore.from_simple_persist_path(simple_path, reduction=reduction, dims=dims)
+    store.persist(quantized_path)
+    return store
@@ -8,9 +8,12 @@ from llama_index.core import (
     Settings,
 )
 from llama_index.core.query_engine import RetrieverQueryEngine
+from llama_index.core.retrievers import BaseRetriever
 from llama_index.llms.openai import OpenAI
 from llama_index.embeddings.huggingface import HuggingFaceEmbedding
 from ai_assistant.config import get_agent_settings
+from ai_assistant.quantized import load_quantized_vector_store
+from ai_assistant.docstore import load_lazy_docstore
 
 SETTINGS = get_agent_settings()
 
@@ -32,12 +35,24 @@ class TravelGuideRAG:
         if not os.path.exists(store_path) and data_dir is not None:
             self.index = self.ingest_data(store_path, data_dir)
         else:
-            self.index = load_index_from_storage(
-                StorageContext.from_defaults(persist_dir=store_path)
-            )
+            self.index = load_index_from_storage(self.get_storage_context(store_path))
 
         self.qa_prompt_tpl = qa_prompt_tpl
 
+    def get_storage_context(self, store_path: str) -> StorageContext:
+        storage_kwargs = {}
+        if SETTINGS.vector_store_mode == "int8":
+            storage_kwargs["vector_store"] = load_quantized_vector_store(
+                store_path,
+                reduction=SETTINGS.vector_store_reduction,
+                dims=SETTINGS.vector_store_dims,
+            )
+        if SETTINGS.docstore_mode == "lazy":
+            storage_kwargs["docstore"] = load_lazy_docstore(
+                store_path, cache_size=SETTINGS.docstore_cache_size
+            )
+        return StorageContext.from_defaults(persist_dir=store_path, **storage_kwargs)
+
     def ingest_data(self, store_path: str, data_dir: str) -> VectorStoreIndex:
         documents = SimpleDirectoryReader(data_dir).load_data()
         index = VectorStoreIndex.from_documents(documents, show_progress=True)
@@ -53,3 +68,6 @@ class TravelGuideRAG:
             )
 
         return query_engine
+
+    def get_retriever(self, similarity_top_k: int = 2) -> BaseRetriever:
+        return self.index.as_retriever(similarity_top_k=similarity_top_k)
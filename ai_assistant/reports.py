@@ -0,0 +1,207 @@
+import os
+import json
+from hashlib import sha256
+from threading import Lock
+from functools import cache
+from llama_index.core import Settings
+from ai_assistant.prompts import city_report_tpl
+from ai_assistant.reservations import (
+    reservation_log_lock,
+    city_key,
+    get_reservation_city,
+    get_reservation_date,
+    get_reservation_type,
+)
+
+
+def log_version(log_file: str) -> str:
+    """
+    Hash del contenido del log de reservas; cambia con cualquier escritura.
+    """
+    return read_log(log_file)[0]
+
+
+def read_log(log_file: str) -> tuple[str, list[dict]]:
+    """
+    Version (hash) y reservas del log, leidas de los mismos bytes para que no
+    correspondan a escrituras distintas.
+    """
+    if not os.path.exists(log_file):
+        return "", []
+    with open(log_file, "rb") as file:
+        content = file.read()
+    try:
+        reservations = json.loads(content) if content else []
+    except json.JSONDecodeError:
+        reservations = []
+    return sha256(content).hexdigest(), reservations
+
+
+def report_cache_path(log_file: str) -> str:
+    return f"{log_file}.report.json"
+
+
+def read_report_cache(log_file: str) -> dict:
+    try:
+        with open(report_cache_path(log_file), "r") as file:
+            return json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def write_report_cache(log_file: str, cache: dict):
+    # Temporal por proceso y reemplazo atomico, igual que write_reservations
+    path = report_cache_path(log_file)
+    tmp_file = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_file, "w") as file:
+        json.dump(cache, file, ensure_ascii=False)
+    os.replace(tmp_file, path)
+
+
+def format_activity(reservation: dict) -> str:
+    activity_type = reservation.get("reservation_type")
+    if activity_type == "TripReservation":
+        return (
+            f"{reservation.get('trip_type', 'Unknown')} de {reservation['departure']} "
+            f"a {reservation['destination']}, Costo: ${reservation['cost']}"
+        )
+    if activity_type == "HotelReservation":
+        return (
+            f"Hotel {reservation['hotel_name']} del {reservation['checkin_date']} "
+            f"al {reservation['checkout_date']}, Costo: ${reservation['cost']}"
+        )
+    if activity_type == "RestaurantReservation":
+        return (
+            f"Restaurante {reservation['restaurant']} el {reservation['reservation_time']}, "
+            f"Costo: ${reservation['cost']}"
+        )
+    return f"{activity_type}, Costo: ${reservation.get('cost', 0)}"
+
+
+def group_by_city(reservations: list[dict]) -> dict[str, list[dict]]:
+    activities_by_city = {}
+    city_names = {}  # Se agrupa sin distinguir mayusculas, con el primer nombre visto
+    for reservation in sorted(reservations, key=get_reservation_date):
+        city = get_reservation_city(reservation)
+        city = city_names.setdefault(city_key(city), city)
+        activities_by_city.setdefault(city, []).append(reservation)
+    return activities_by_city
+
+
+def section_hash(activities: list[dict]) -> str:
+    return sha256(json.dumps(activities, sort_keys=True).encode()).hexdigest()
+
+
+def generate_city_narrative(city: str, activities: list[dict]) -> str:
+    activities_str = "\n".join(
+        f"- {get_reservation_date(activity)}: {format_activity(activity)}"
+        for activity in activities
+    )
+    prompt = city_report_tpl.format(city=city, activities_str=activities_str)
+    return Settings.llm.complete(prompt).text.strip()
+
+
+def render_report(reservations: list[dict], sections: dict[str, list[dict]], narratives: dict[str, str]) -> str:
+    # Partes deterministas (totales y cronologia) calculadas localmente
+    total_cost = sum(reservation.get("cost", 0) for reservation in reservations)
+    cost_by_type = {}
+    for reservation in reservations:
+        # Mismos tipos que /reservations?type= (vuelos y buses por separado)
+        activity_type = get_reservation_type(reservation).value
+        cost_by_type[activity_type] = cost_by_type.get(activity_type, 0) + reservation.get("cost", 0)
+
+    report = "📝 **Reporte del Viaje**\n\n"
+    report += "**Cronología**\n"
+    for reservation in sorted(reservations, key=get_reservation_date):
+        report += f"- {get_reservation_date(reservation)} ({get_reservation_city(reservation)}): {format_activity(reservation)}\n"
+    report += "\n"
+
+    for city, activities in sections.items():
+        report += f"**Ciudad: {city}**\n"
+        report += f"Costo en {city}: ${sum(activity.get('cost', 0) for activity in activities)}\n\n"
+        report += f"{narratives[city_key(city)]}\n\n"
+
+    report += "**Costos por tipo de reserva**\n"
+    for activity_type, cost in cost_by_type.items():
+        report += f"- {activity_type}: ${cost}\n"
+    report += f"\n**Costo Total del Viaje: ${total_cost}**\n"
+    return report
+
+
+class TripReportCache:
+    """
+    Reporte del viaje cacheado por la version (hash) del log de reservas.
+
+    Si el log no cambio se devuelve el reporte anterior sin llamar al LLM. Si
+    cambio, solo se regenera la narrativa de las ciudades cuyas reservas
+    cambiaron; totales y cronologia se calculan localmente.
+
+    El cache se guarda tambien junto al log (`<log_file>.report.json`), asi
+    sobrevive a reinicios y lo comparten los workers: solo uno genera a la vez
+    y el resto reutiliza lo que escribio.
+    """
+
+    def __init__(self, log_file: str):
+        self.log_file = log_file
+        self.version: str | None = None
+        self.report: str | None = None
+        self.narratives: dict[str, tuple[str, str]] = {}  # ciudad -> (hash, narrativa)
+        self.lock = Lock()
+
+    def get_report(self) -> str:
+        with self.lock:
+            if log_version(self.log_file) == self.version:
+                return self.report
+            # Lock del cache en disco: si otro worker esta generando se espera y se usa su resultado
+            with reservation_log_lock(report_cache_path(self.log_file)):
+                with reservation_log_lock(self.log_file, exclusive=False):
+                    version, reservations = read_log(self.log_file)
+                self.load_cache()
+                if version != self.version:
+                    # Las llamadas al LLM se hacen sin bloquear el log de reservas
+                    self.report = self.build_report(reservations)
+                    self.version = version
+                    with reservation_log_lock(self.log_file):
+                        write_report_cache(self.log_file, self.to_cache())
+            return self.report
+
+    def load_cache(self):
+        cache = read_report_cache(self.log_file)
+        if not cache:
+            return
+        self.version = cache["version"]
+        self.report = cache["report"]
+        self.narratives = {key: tuple(value) for key, value in cache["narratives"].items()}
+
+    def to_cache(self) -> dict:
+        return {"version": self.version, "report": self.report, "narratives": self.narratives}
+
+    def build_report(self, reservations: list[dict]) -> str:
+        if not reservations:
+            self.narratives = {}
+            return "No se encontraron reservas para el viaje."
+
+        sections = group_by_city(reservations)
+        narratives = {}
+        for city, activities in sections.items():
+            key = city_key(city)
+            activities_hash = section_hash(activities)
+            cached = self.narratives.get(key)
+            if cached is not None and cached[0] == activities_hash:
+                narratives[key] = cached
+            else:
+                print(f"generating trip report section for {city}")
+                narratives[key] = (activities_hash, generate_city_narrative(city, activities))
+        # Se descartan las ciudades que ya no estan en el log
+        self.narratives = narratives
+
+        return render_report(
+            reservations,
+            sections,
+            {key: narrative for key, (_, narrative) in narratives.items()},
+        )
+
+
+@cache
+def get_trip_report_cache(log_file: str) -> TripReportCache:
+    return TripReportCache(log_file)
@@ -0,0 +1,245 @@
+import os
+import json
+import sys
+import fcntl
+from contextlib import contextmanager
+from threading import RLock
+from bisect import bisect_left, bisect_right, insort
+from datetime import date
+from functools import cache
+from ai_assistant.models import ReservationType, TripType
+from ai_assistant.config import get_agent_settings
+
+SETTINGS = get_agent_settings()
+
+# Entradas de los indices: (fecha ISO, id). Ordenar tuplas ordena por fecha y luego por id.
+IndexEntry = tuple[str, int]
+
+
+def get_reservation_type(reservation: dict) -> ReservationType:
+    kind = reservation.get("reservation_type")
+    if kind == "HotelReservation":
+        return ReservationType.hotel
+    if kind == "RestaurantReservation":
+        return ReservationType.restaurant
+    if reservation.get("trip_type") == TripType.bus.value:
+        return ReservationType.bus
+    return ReservationType.flight
+
+
+def get_reservation_city(reservation: dict) -> str:
+    # Igual que generate_trip_summary: se usa 'city' o 'destination'
+    return reservation.get("city", reservation.get("destination")) or ""
+
+
+def get_reservation_date(reservation: dict) -> str:
+    value = (
+        reservation.get("date")
+        or reservation.get("checkin_date")
+        or reservation.get("reservation_time")
+    )
+    return str(value)[:10]  # Solo la parte YYYY-MM-DD
+
+
+def city_key(city: str) -> str:
+    return city.strip().lower()
+
+
+@contextmanager
+def reservation_log_lock(log_file: str, exclusive: bool = True):
+    """
+    Lock entre procesos sobre el log de reservas (flock en un archivo `.lock`
+    aparte, para que el reemplazo atomico del log no lo invalide). No es
+    reentrante: dentro del lock se usa read_reservations, no load_reservations,
+    y nunca se llama a get_reservation_index() (la primera llamada sincroniza
+    el indice con un lock compartido y el proceso se bloquearia a si mismo);
+    el indice se obtiene antes de tomar el lock.
+    """
+    with open(f"{log_file}.lock", "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def log_signature(log_file: str) -> tuple[int, int, int] | None:
+    try:
+        stat = os.stat(log_file)
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+def read_reservations(log_file: str) -> list[dict]:
+    if not os.path.exists(log_file) or os.path.getsize(log_file) == 0:
+        return []
+    with open(log_file, "r") as file:
+        try:
+            return json.load(file)
+        except json.JSONDecodeError:
+            return []
+
+
+def load_reservations(log_file: str) -> list[dict]:
+    with reservation_log_lock(log_file, exclusive=False):
+        return read_reservations(log_file)
+
+
+def write_reservations(log_file: str, reservations: list[dict], **dump_kwargs):
+    # Se escribe a un temporal y se reemplaza, asi ningun lector ve el log a medias
+    tmp_file = f"{log_file}.{os.getpid()}.tmp"
+    with open(tmp_file, "w") as file:
+        json.dump(reservations, file, **dump_kwargs)
+    os.replace(tmp_file, log_file)
+
+
+class ReservationIndex:
+    """
+    Indices secundarios en memoria sobre el log de reservas.
+
+    Cada indice es una lista ordenada de (fecha, id), de modo que un rango de
+    fechas se resuelve con bisect en O(log n) y luego se recorren solo los k
+    resultados. El id de una reserva es su posicion en el log.
+
+    `signature` identifica la version del log que reflejan los indices; con
+    varios workers, `sync` los recarga si otro proceso escribio el log.
+    """
+
+    def __init__(self, reservations: list[dict] | None = None):
+        self.lock = RLock()
+        self.signature: tuple[int, int, int] | None = None
+        self.load(reservations or [])
+
+    def clear(self):
+        self.reservations: list[dict] = []
+        self.by_date: list[IndexEntry] = []
+        self.by_city: dict[str, list[IndexEntry]] = {}
+        self.by_type: dict[ReservationType, list[IndexEntry]] = {}
+
+    def load(self, reservations: list[dict]):
+        # Reconstruccion completa: se agrega todo y se ordena una sola vez
+        with self.lock:
+            self.clear()
+            for reservation_id, reservation in enumerate(reservations):
+                self.reservations.append(reservation)
+                for entries in self._entries_for(reservation):
+                    entries.append((get_reservation_date(reservation), reservation_id))
+            for entries in self._all_indexes():
+                entries.sort()
+
+    def add(self, reservation: dict, signature: tuple[int, int, int] | None = None) -> int:
+        with self.lock:
+            reservation_id = len(self.reservations)
+            self.reservations.append(reservation)
+            for entries in self._entries_for(reservation):
+                insort(entries, (get_reservation_date(reservation), reservation_id))
+            if signature is not None:
+                self.signature = signature
+            return reservation_id
+
+    def ensure_loaded(self, reservations: list[dict], signature: tuple[int, int, int] | None):
+        """
+        Recarga los indices con `reservations` si no reflejan la version `signature` del log.
+        """
+        with self.lock:
+            if signature != self.signature:
+                self.load(reservations)
+                self.signature = signature
+
+    def sync(self, log_file: str):
+        if log_signature(log_file) == self.signature:
+            return
+        with reservation_log_lock(log_file, exclusive=False):
+            self.ensure_loaded(read_reservations(log_file), log_signature(log_file))
+
+    def query(
+        self,
+        reservation_type: ReservationType | None = None,
+        city: str | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        cursor: str | None = None,
+        limit: int = 20,
+    ) -> tuple[list[dict], str | None]:
+        """
+        Devuelve las reservas que cumplen los filtros, ordenadas por fecha, y el
+        cursor de la siguiente pagina (None si no hay mas resultados).
+        """
+        with self.lock:
+            return self._query(reservation_type, city, start_date, end_date, cursor, limit)
+
+    def _query(
+        self,
+        reservation_type: ReservationType | None,
+        city: str | None,
+        start_date: date | None,
+        end_date: date | None,
+        cursor: str | None,
+        limit: int,
+    ) -> tuple[list[dict], str | None]:
+        # Se recorre el indice mas selectivo y se filtra el resto en memoria
+        candidates = [self.by_date]
+        if city is not None:
+            candidates.append(self.by_city.get(city_key(city), []))
+        if reservation_type is not None:
+            candidates.append(self.by_type.get(reservation_type, []))
+        entries = min(candidates, key=len)
+
+        lo = 0
+        if start_date is not None:
+            lo = bisect_left(entries, (start_date.isoformat(), -1))
+        if cursor is not None:
+            lo = max(lo, bisect_right(entries, decode_cursor(cursor)))
+        hi = len(entries)
+        if end_date is not None:
+            hi = bisect_right(entries, (end_date.isoformat(), sys.maxsize))
+
+        results = []
+        last_entry = None
+        next_cursor = None
+        for position in range(lo, hi):
+            entry = entries[position]
+            reservation = self.reservations[entry[1]]
+            if city is not None and city_key(get_reservation_city(reservation)) != city_key(city):
+                continue
+            if reservation_type is not None and get_reservation_type(reservation) != reservation_type:
+                continue
+            if len(results) == limit:
+                next_cursor = encode_cursor(last_entry)
+                break
+            results.append({"id": entry[1], **reservation})
+            last_entry = entry
+
+        return results, next_cursor
+
+    def _entries_for(self, reservation: dict) -> list[list[IndexEntry]]:
+        city = city_key(get_reservation_city(reservation))
+        kind = get_reservation_type(reservation)
+        return [
+            self.by_date,
+            self.by_city.setdefault(city, []),
+            self.by_type.setdefault(kind, []),
+        ]
+
+    def _all_indexes(self) -> list[list[IndexEntry]]:
+        return [self.by_date, *self.by_city.values(), *self.by_type.values()]
+
+
+def encode_cursor(entry: IndexEntry) -> str:
+    return f"{entry[0]}:{entry[1]}"
+
+
+def decode_cursor(cursor: str) -> IndexEntry:
+    try:
+        entry_date, reservation_id = cursor.rsplit(":", 1)
+        return date.fromisoformat(entry_date).isoformat(), int(reservation_id)
+    except ValueError:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+
+
+@cache
+def get_reservation_index() -> ReservationIndex:
+    index = ReservationIndex()
+    index.sync(SETTINGS.log_file)
+    return index
@@ -0,0 +1,98 @@
+"""
+Servidor multi-worker con carga previa al fork.
+
+`uvicorn --workers N` arranca cada worker con spawn, asi que cada uno vuelve a
+cargar el indice y el modelo de embeddings. Aqui el proceso padre importa la
+app una sola vez (indice, modelo, reservas) y luego hace fork de los workers,
+que comparten esas paginas copy-on-write y aceptan conexiones del mismo socket.
+
+    python -m ai_assistant.server --workers 4 --port 8000
+
+Con `--no-preload` los workers los arranca el supervisor de uvicorn (spawn, cada
+uno carga la app), igual que `uvicorn --workers N`, pero sobre el mismo socket
+que el modo con carga previa; sirve de referencia para comparar ambos.
+"""
+import os
+import gc
+import signal
+import socket
+import argparse
+import uvicorn
+from uvicorn.supervisors import Multiprocess
+
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    # Lo heredan los sockets aceptados; sin esto cada respuesta espera el ACK retrasado (~40 ms)
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_worker(app, sock: socket.socket):
+    config = uvicorn.Config(app, log_level="info")
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def serve(host: str, port: int, workers: int):
+    # Carga previa: todo lo que se importa aqui queda compartido con los workers
+    from ai_assistant.api import app
+
+    sock = bind_socket(host, port)
+    # Los objetos ya cargados no se vuelven a tocar por el GC, asi sus paginas
+    # no se copian en cada worker
+    gc.freeze()
+
+    children = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            run_worker(app, sock)
+            os._exit(0)
+        children.append(pid)
+    print(f"serving on http://{host}:{port} with {workers} workers: {children}")
+
+    def stop(signum, frame):
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+    for pid in children:
+        os.waitpid(pid, 0)
+    sock.close()
+
+
+def serve_without_preload(host: str, port: int, workers: int):
+    config = uvicorn.Config("ai_assistant.api:app", workers=workers, log_level="info")
+    sock = bind_socket(host, port)
+    if workers > 1:
+        Multiprocess(config, sockets=[sock]).run()
+    else:
+        uvicorn.Server(config).run(sockets=[sock])
+    sock.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--no-preload", action="store_true", help="cada worker carga la app (supervisor de uvicorn)")
+    args = parser.parse_args()
+    if args.no_preload:
+        serve_without_preload(args.host, args.port, args.workers)
+    else:
+        serve(args.host, args.port, args.workers)
+
+
+if __name__ == "__main__":
+    main()
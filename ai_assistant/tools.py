@@ -16,12 +16,14 @@ from ai_assistant.utils import save_reservation, delete_all_reservations
 
 SETTINGS = get_agent_settings()
 
+travel_guide_rag = TravelGuideRAG(
+    store_path=SETTINGS.travel_guide_store_path,
+    data_dir=SETTINGS.travel_guide_data_path,
+    qa_prompt_tpl=travel_guide_qa_tpl,
+)
+
 travel_guide_tool = QueryEngineTool(
-    query_engine=TravelGuideRAG(
-        store_path=SETTINGS.travel_guide_store_path,
-        data_dir=SETTINGS.travel_guide_data_path,
-        qa_prompt_tpl=travel_guide_qa_tpl,
-    ).get_query_engine(),
+    query_engine=travel_guide_rag.get_query_engine(),
     metadata=ToolMetadata(
         name="travel_guide", description=travel_guide_description, return_direct=False
     )
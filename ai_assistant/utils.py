@@ -1,5 +1,3 @@
-import os
-import json
 from datetime import date, datetime
 from ai_assistant.models import (
     RestaurantReservation,
@@ -8,6 +6,13 @@ from ai_assistant.models import (
     TripType
 )
 from ai_assistant.config import get_agent_settings
+from ai_assistant.reservations import (
+    get_reservation_index,
+    reservation_log_lock,
+    read_reservations,
+    write_reservations,
+    log_signature,
+)
 
 SETTINGS = get_agent_settings()
 
@@ -23,27 +28,31 @@ def save_reservation(
 ):
     reservation_dict = reservation.model_dump()
     print(f"saving reservation: {reservation_dict}")
-    reservations = []
-    if os.path.exists(SETTINGS.log_file) and os.path.getsize(SETTINGS.log_file) > 0:
-        with open(SETTINGS.log_file, "r") as file:
-            try:
-                reservations = json.load(file)
-            except json.JSONDecodeError:
-                reservation = []
-    else:
-        reservations = []
     reservation_dict["reservation_type"] = reservation.__class__.__name__
-    reservations.append(reservation_dict)
+    index = get_reservation_index()
+
+    # Lock entre workers: leer, agregar y reemplazar el log es una sola operacion
+    with reservation_log_lock(SETTINGS.log_file):
+        reservations = read_reservations(SETTINGS.log_file)
+        # Si otro worker escribio el log, los indices se recargan antes de agregar
+        index.ensure_loaded(reservations, log_signature(SETTINGS.log_file))
+        reservations.append(reservation_dict)
+        write_reservations(SETTINGS.log_file, reservations, indent=4, default=custom_serializer)
 
-    with open(SETTINGS.log_file, "w") as file:
-        json.dump(reservations, file, indent=4, default=custom_serializer)
+        # Mantener los indices en memoria al dia con el log
+        indexed = reservation.model_dump(mode="json")
+        indexed["reservation_type"] = reservation_dict["reservation_type"]
+        index.add(indexed, signature=log_signature(SETTINGS.log_file))
 
     print(f"saved reservation!")
 
 def delete_all_reservations():
     try:
-        with open(SETTINGS.log_file, 'w') as file:
-            json.dump([], file)  # Escribir una lista vacía para vaciar los registros
+        # Antes del lock: crear el indice toma un lock compartido sobre el mismo archivo
+        index = get_reservation_index()
+        with reservation_log_lock(SETTINGS.log_file):
+            write_reservations(SETTINGS.log_file, [])  # Escribir una lista vacía para vaciar los registros
+            index.ensure_loaded([], log_signature(SETTINGS.log_file))
         print("All reservations have been deleted.")
     except FileNotFoundError:
         print("The trip log file (trip.json) was not found.")
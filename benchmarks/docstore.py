@@ -0,0 +1,103 @@
+"""
+Arranque en frio y memoria del docstore JSON contra el docstore compacto lazy.
+
+Cada modo corre en un proceso nuevo: mide el tiempo de importar y cargar el
+docstore, el RSS agregado y el pico de memoria de Python (tracemalloc), y luego
+la latencia de leer k nodos al azar, como en una consulta top-k. Se corre como
+modulo desde la raiz del repo, para que `ai_assistant` sea importable:
+
+    python -m benchmarks.docstore --store-path travel_guide_store -k 2
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import subprocess
+import tracemalloc
+
+
+def rss_kb() -> int:
+    with open("/proc/self/status") as file:
+        for line in file:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+def measure(mode: str, store_path: str, k: int, rounds: int) -> dict:
+    from llama_index.core.storage.docstore import SimpleDocumentStore
+    from ai_assistant.docstore import LazyDocumentStore, DOCSTORE_INDEX_FNAME
+
+    rss_before = rss_kb()
+    tracemalloc.start()
+    start = time.perf_counter()
+    if mode == "json":
+        docstore = SimpleDocumentStore.from_persist_dir(store_path)
+    else:
+        docstore = LazyDocumentStore.from_persist_dir(store_path)
+    load_ms = (time.perf_counter() - start) * 1000
+    _, load_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_after = rss_kb()
+
+    # Ids de los nodos tomados del indice compacto, fuera de la medicion de carga
+    with open(os.path.join(store_path, DOCSTORE_INDEX_FNAME), "r") as file:
+        node_ids = list(json.load(file)["offsets"])
+    random.seed(0)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        docstore.get_nodes(random.sample(node_ids, k), raise_error=False)
+    fetch_ms = (time.perf_counter() - start) / rounds * 1000
+
+    return {
+        "mode": mode,
+        "load_ms": load_ms,
+        "rss_mb": (rss_after - rss_before) / 1024,
+        "peak_mb": load_peak / 1e6,
+        "fetch_ms": fetch_ms,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--store-path", default="travel_guide_store")
+    parser.add_argument("-k", type=int, default=2)
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--child", choices=["json", "lazy"])
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(args.child, args.store_path, args.k, args.rounds)))
+        return
+
+    from ai_assistant.docstore import (
+        DOCSTORE_JSON_FNAME,
+        DOCSTORE_BIN_FNAME,
+        DOCSTORE_INDEX_FNAME,
+        compact_docstore_is_stale,
+        convert_docstore,
+        docstore_lock,
+    )
+
+    with docstore_lock(args.store_path):
+        if compact_docstore_is_stale(args.store_path):
+            convert_docstore(args.store_path)
+    for fname in (DOCSTORE_JSON_FNAME, DOCSTORE_BIN_FNAME, DOCSTORE_INDEX_FNAME):
+        print(f"{fname}: {os.path.getsize(os.path.join(args.store_path, fname)) / 1e6:.2f} MB")
+
+    print(f"\n{'mode':<6}{'load ms':>10}{'RSS MB':>10}{'peak MB':>10}{f'top-{args.k} ms':>10}")
+    for mode in ("json", "lazy"):
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.docstore", "--child", mode, "--store-path", args.store_path,
+             "-k", str(args.k), "--rounds", str(args.rounds)],
+            capture_output=True, text=True, check=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(f"{result['mode']:<6}{result['load_ms']:>10.1f}{result['rss_mb']:>10.1f}"
+              f"{result['peak_mb']:>10.1f}{result['fetch_ms']:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
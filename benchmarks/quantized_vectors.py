@@ -0,0 +1,151 @@
+"""
+Compara el QuantizedVectorStore (int8, con y sin reduccion de dimension) contra
+la busqueda en precision completa sobre el indice existente.
+
+Por defecto las consultas son preguntas reales (QUERIES) embebidas con el mismo
+modelo e5 que usa la app, con el prefijo `query: ` de e5 (`--query-instruction ""`
+reproduce exactamente rags.py, que no agrega prefijo). Con `--query-mode passages`
+las consultas son los propios vectores del indice (leave-one-out: el vector de la
+consulta se excluye de los resultados); no hace falta cargar el modelo, pero el
+recall mide similitud pasaje-pasaje, no consultas reales.
+
+Reporta recall@k, memoria de los vectores y latencia por consulta. Se corre como
+modulo desde la raiz del repo, para que `ai_assistant` sea importable:
+
+    python -m benchmarks.quantized_vectors --store-path travel_guide_store -k 2 -k 10
+"""
+import os
+import json
+import time
+import argparse
+import tracemalloc
+import numpy as np
+from ai_assistant.quantized import QuantizedVectorStore, SIMPLE_VECTOR_STORE_FNAME
+
+CONFIGS = [
+    ("none", None),
+    ("pca", 384),
+    ("pca", 256),
+    ("pca", 128),
+    ("truncate", 384),
+    ("truncate", 256),
+]
+
+QUERIES = [
+    "¿Qué lugares visitar en La Paz?",
+    "Hoteles recomendados en Sucre",
+    "Restaurantes de comida típica en Cochabamba",
+    "¿Cómo llegar al Salar de Uyuni y cuántos días quedarse?",
+    "Actividades en el lago Titicaca y la Isla del Sol",
+    "Mejor época para visitar Potosí y las minas del Cerro Rico",
+    "Ruta de trekking en la Cordillera Real",
+    "Qué hacer en Santa Cruz de la Sierra",
+    "Misiones jesuíticas de Chiquitos",
+    "Parque Nacional Madidi y tours desde Rurrenabaque",
+    "Carnaval de Oruro: fechas y consejos",
+    "Transporte en bus entre La Paz y Copacabana",
+    "Seguridad y mal de altura en el altiplano",
+    "Museos y arquitectura colonial en Sucre",
+    "Tiwanaku: historia y cómo visitarlo",
+    "Vida nocturna en La Paz",
+    "Mercados y artesanías en Tarija",
+    "Viñedos y vino en el valle de Tarija",
+    "Camino de la Muerte en bicicleta desde La Paz",
+    "Hostales económicos en Uyuni",
+]
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top])]
+
+
+def embed_queries(query_instruction: str) -> np.ndarray:
+    from llama_index.embeddings.huggingface import HuggingFaceEmbedding
+    from ai_assistant.config import get_agent_settings
+
+    embed_model = HuggingFaceEmbedding(
+        model_name=get_agent_settings().hf_embeddings_model,
+        query_instruction=query_instruction or None,
+    )
+    return np.asarray([embed_model.get_query_embedding(query) for query in QUERIES], dtype=np.float32)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--store-path", default="travel_guide_store")
+    parser.add_argument("-k", type=int, action="append", help="k para recall@k (repetible)")
+    parser.add_argument("--query-mode", choices=["e5", "passages"], default="e5")
+    parser.add_argument("--query-instruction", default="query: ")
+    parser.add_argument("--queries", type=int, default=200, help="consultas en modo passages")
+    args = parser.parse_args()
+    ks = args.k or [2, 10]
+
+    persist_path = os.path.join(args.store_path, SIMPLE_VECTOR_STORE_FNAME)
+    if not os.path.exists(persist_path):
+        raise SystemExit(f"{persist_path} not found: the float vector store is needed as the baseline")
+    tracemalloc.start()
+    start = time.perf_counter()
+    with open(persist_path, "r") as file:
+        data = json.load(file)
+    json_load_s = time.perf_counter() - start
+    _, json_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    embedding_dict = data["embedding_dict"]
+    ids = list(embedding_dict.keys())
+    full = np.asarray([embedding_dict[node_id] for node_id in ids], dtype=np.float32)
+    full /= np.linalg.norm(full, axis=1, keepdims=True)
+
+    if args.query_mode == "e5":
+        queries = embed_queries(args.query_instruction)
+        excluded = [None] * len(queries)
+        query_desc = f"{len(queries)} e5 queries (instruction {args.query_instruction!r})"
+    else:
+        rows = np.random.default_rng(0).choice(len(ids), size=min(args.queries, len(ids)), replace=False)
+        queries = full[rows]
+        excluded = list(rows)
+        query_desc = f"{len(queries)} leave-one-out passage queries (doc-to-doc proxy, not real queries)"
+    queries = queries / np.linalg.norm(queries, axis=1, keepdims=True)
+
+    print(f"{len(ids)} vectors, {full.shape[1]} dims, {query_desc}")
+    print(f"JSON store: {os.path.getsize(persist_path) / 1e6:.1f} MB on disk, "
+          f"load {json_load_s * 1000:.0f} ms, peak {json_peak / 1e6:.1f} MB")
+
+    def search(score_fn) -> tuple[list[np.ndarray], float]:
+        results = []
+        start = time.perf_counter()
+        for query, skip in zip(queries, excluded):
+            scores = score_fn(query)
+            if skip is not None:
+                scores[skip] = -np.inf
+            results.append(top_k(scores, max(ks)))
+        return results, (time.perf_counter() - start) / len(queries) * 1000
+
+    # Resultados exactos en float32
+    truth, float_ms = search(lambda query: full @ query)
+    print(f"float32: {full.nbytes / 1e6:.2f} MB, {float_ms:.3f} ms/query\n")
+
+    header = f"{'mode':<16}{'MB':>8}{'ms/query':>10}" + "".join(f"{f'recall@{k}':>11}" for k in ks)
+    print(header)
+    print("-" * len(header))
+    for reduction, dims in CONFIGS:
+        if dims is not None and dims >= full.shape[1]:
+            continue
+        store = QuantizedVectorStore.from_embeddings(
+            embedding_dict, data["text_id_to_ref_doc_id"], reduction=reduction, dims=dims
+        )
+        results, elapsed_ms = search(store.score)
+        hits = {
+            k: sum(len(set(result[:k]) & set(expected[:k])) for result, expected in zip(results, truth))
+            for k in ks
+        }
+
+        name = "int8" if reduction == "none" else f"int8+{reduction}{dims}"
+        row = f"{name:<16}{store.nbytes / 1e6:>8.2f}{elapsed_ms:>10.3f}"
+        row += "".join(f"{hits[k] / (k * len(queries)):>11.3f}" for k in ks)
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
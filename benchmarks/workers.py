@@ -0,0 +1,157 @@
+"""
+Memoria y throughput con 1, 4 y 8 workers: servidor con carga previa al fork
+(ai_assistant.server) contra los workers del supervisor de uvicorn, como en
+`uvicorn ai_assistant.api:app --workers N`, donde cada worker carga su propia
+copia del indice y del modelo. Ambos escuchan en un socket creado por
+server.bind_socket (mismas opciones, TCP_NODELAY incluido), asi la diferencia
+de throughput viene de la carga previa y no de la configuracion del socket.
+
+Para cada configuracion arranca el servidor sobre una copia del log de reservas,
+mide RSS y PSS (memoria proporcional: las paginas compartidas copy-on-write se
+reparten entre los procesos que las usan) de todo el arbol de procesos, y luego
+las requests por segundo con clientes concurrentes en dos grupos de rutas:
+GET /reservations (indices en memoria) y GET /travel-guide/search (embedding de
+la consulta con el modelo, vector store y docstore; sin LLM).
+
+    python -m benchmarks.workers --workers 1 --workers 4 --workers 8
+"""
+import os
+import sys
+import time
+import shutil
+import signal
+import argparse
+import tempfile
+import subprocess
+import http.client
+from concurrent.futures import ThreadPoolExecutor
+
+PATHS = {
+    "reservations": [
+        "/reservations",
+        "/reservations?city=Sucre",
+        "/reservations?type=HOTEL&start_date=2023-10-20&end_date=2023-10-31",
+    ],
+    "search": [
+        "/travel-guide/search?query=hoteles%20en%20Sucre",
+        "/travel-guide/search?query=que%20visitar%20en%20el%20Salar%20de%20Uyuni",
+        "/travel-guide/search?query=restaurantes%20en%20La%20Paz",
+    ],
+}
+SERVERS = {
+    "preload": lambda workers, port: [
+        sys.executable, "-m", "ai_assistant.server", "--workers", str(workers), "--port", str(port),
+    ],
+    "uvicorn": lambda workers, port: [
+        sys.executable, "-m", "ai_assistant.server", "--no-preload", "--workers", str(workers), "--port", str(port),
+    ],
+}
+
+
+def process_tree(pid: int) -> list[int]:
+    pids = [pid]
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as file:
+            for child in file.read().split():
+                pids.extend(process_tree(int(child)))
+    except FileNotFoundError:
+        pass
+    return pids
+
+
+def memory_kb(pid: int) -> tuple[int, int]:
+    """
+    (RSS, PSS) en kB de un proceso, leidos de /proc/<pid>/smaps_rollup.
+    """
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as file:
+        for line in file:
+            parts = line.split()
+            if parts[0] in ("Rss:", "Pss:"):
+                values[parts[0]] = int(parts[1])
+    return values["Rss:"], values["Pss:"]
+
+
+def wait_until_ready(process: subprocess.Popen, port: int, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"server exited with code {process.returncode} before becoming ready")
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            connection.request("GET", "/reservations")
+            if connection.getresponse().status == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.5)
+    raise TimeoutError(f"server on port {port} not ready after {timeout}s")
+
+
+def client_loop(port: int, paths: list[str], deadline: float) -> int:
+    connection = http.client.HTTPConnection("127.0.0.1", port)
+    requests = 0
+    while time.monotonic() < deadline:
+        connection.request("GET", paths[requests % len(paths)])
+        response = connection.getresponse()
+        response.read()
+        requests += 1
+    connection.close()
+    return requests
+
+
+def throughput(port: int, paths: list[str], clients: int, duration: float) -> float:
+    deadline = time.monotonic() + duration
+    with ThreadPoolExecutor(clients) as pool:
+        total = sum(pool.map(lambda _: client_loop(port, paths, deadline), range(clients)))
+    return total / duration
+
+
+def run(server: str, workers: int, port: int, clients: int, duration: float, log_file: str) -> None:
+    env = dict(os.environ, LOG_FILE=log_file)
+    process = subprocess.Popen(
+        SERVERS[server](workers, port),
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_until_ready(process, port, timeout=600)
+        # Se espera a que arranquen todos los workers antes de medir memoria
+        time.sleep(5)
+        pids = process_tree(process.pid)
+        rss, pss = map(sum, zip(*(memory_kb(pid) for pid in pids)))
+        rates = [throughput(port, PATHS[group], clients, duration) for group in PATHS]
+        print(
+            f"{server:<9}{workers:>8}{len(pids):>7}{rss / 1024:>10.0f}{pss / 1024:>10.0f}"
+            + "".join(f"{rate:>20.0f}" for rate in rates)
+        )
+    finally:
+        process.send_signal(signal.SIGTERM)
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, action="append")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--log-file", default="trip.json")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Se trabaja sobre una copia para no modificar el log real
+        log_file = os.path.join(tmp_dir, "trip.json")
+        shutil.copy(args.log_file, log_file)
+        print(
+            f"{'server':<9}{'workers':>8}{'procs':>7}{'RSS MB':>10}{'PSS MB':>10}"
+            + "".join(f"{f'{group} req/s':>20}" for group in PATHS)
+        )
+        for workers in args.workers or [1, 4, 8]:
+            for server in SERVERS:
+                run(server, workers, args.port, args.clients, args.duration, log_file)
+
+
+if __name__ == "__main__":
+    main()